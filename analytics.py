@@ -0,0 +1,129 @@
+from datetime import datetime
+from threading import Lock
+
+# Outcomes that mean somebody picked up the phone
+ANSWERED_OUTCOMES = {"answered_no_transfer", "successfully_transferred"}
+TRANSFERRED_OUTCOME = "successfully_transferred"
+
+# Durations are bucketed per second; anything longer lands in the last bucket
+MAX_TRACKED_DURATION = 3600
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _empty_bucket() -> dict:
+    return {"calls": 0, "answered": 0, "transferred": 0}
+
+
+def _rates(bucket: dict) -> dict:
+    calls = bucket["calls"]
+    answered = bucket["answered"]
+    return {
+        "calls": calls,
+        "answered": answered,
+        "transferred": bucket["transferred"],
+        "answer_rate": round(answered / calls, 4) if calls else 0.0,
+        # Transfer rate is measured against answered calls, not dialled ones
+        "transfer_rate": round(bucket["transferred"] / answered, 4) if answered else 0.0,
+    }
+
+
+class CampaignAnalytics:
+    """
+    Rollups for the current campaign, updated once per finished call.
+
+    Every counter is bumped in place when a call outcome is recorded, so a
+    snapshot never has to look at call_results.json or the output CSVs.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.total_calls = 0
+            self.outcomes: dict[str, int] = {}
+            self.by_hour = [_empty_bucket() for _ in range(24)]
+            self.by_client: dict[str, dict] = {}
+            self.duration_histogram = [0] * (MAX_TRACKED_DURATION + 1)
+            self.duration_count = 0
+            self.duration_total = 0
+            self.duration_over_cap = 0
+
+    def record(self, outcome: str, client: str, duration: int, when: datetime = None):
+        when = when or datetime.now()
+        answered = outcome in ANSWERED_OUTCOMES
+        transferred = outcome == TRANSFERRED_OUTCOME
+
+        with self.lock:
+            self.total_calls += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+            client_bucket = self.by_client.get(client)
+            if client_bucket is None:
+                client_bucket = self.by_client[client] = _empty_bucket()
+
+            for bucket in (self.by_hour[when.hour], client_bucket):
+                bucket["calls"] += 1
+                if answered:
+                    bucket["answered"] += 1
+                if transferred:
+                    bucket["transferred"] += 1
+
+            # Only answered calls have a meaningful talk time. Mean and
+            # percentiles share the same cap; longer calls are counted apart.
+            if answered:
+                duration = max(duration, 0)
+                if duration > MAX_TRACKED_DURATION:
+                    self.duration_over_cap += 1
+                    duration = MAX_TRACKED_DURATION
+                self.duration_histogram[duration] += 1
+                self.duration_count += 1
+                self.duration_total += duration
+
+    def _duration_percentiles(self) -> dict:
+        result = {f"p{p}": None for p in PERCENTILES}
+        if not self.duration_count:
+            return result
+
+        targets = [(p, max(1, -(-self.duration_count * p // 100))) for p in PERCENTILES]
+        seen = 0
+        idx = 0
+        for seconds, n in enumerate(self.duration_histogram):
+            if not n:
+                continue
+            seen += n
+            while idx < len(targets) and seen >= targets[idx][1]:
+                result[f"p{targets[idx][0]}"] = seconds
+                idx += 1
+            if idx == len(targets):
+                break
+        return result
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "total_calls": self.total_calls,
+                "outcomes": dict(self.outcomes),
+                "overall": _rates({
+                    "calls": self.total_calls,
+                    "answered": sum(self.outcomes.get(o, 0) for o in ANSWERED_OUTCOMES),
+                    "transferred": self.outcomes.get(TRANSFERRED_OUTCOME, 0),
+                }),
+                "by_hour": {
+                    f"{hour:02d}": _rates(bucket)
+                    for hour, bucket in enumerate(self.by_hour)
+                    if bucket["calls"]
+                },
+                "by_client": {
+                    client: _rates(bucket)
+                    for client, bucket in self.by_client.items()
+                },
+                "duration_seconds": {
+                    "answered_calls": self.duration_count,
+                    "capped_at": MAX_TRACKED_DURATION,
+                    "over_cap": self.duration_over_cap,
+                    "mean": round(self.duration_total / self.duration_count, 1) if self.duration_count else None,
+                    **self._duration_percentiles(),
+                },
+            }
@@ -6,6 +6,15 @@ load_dotenv()
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
+# Point at a local fake of the REST API to test the call reconciler
+TWILIO_API_BASE = os.getenv("TWILIO_API_BASE", "https://api.twilio.com")
+
+# Calls with no final status after this long are looked up in the Calls API
+RECONCILE_TIMEOUT_SECONDS = int(os.getenv("RECONCILE_TIMEOUT_SECONDS", "300"))
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("RECONCILE_INTERVAL_SECONDS", "60"))
+RECONCILE_MAX_REQUESTS_PER_SECOND = float(os.getenv("RECONCILE_MAX_REQUESTS_PER_SECOND", "2"))
+# ...and settled as "failed" if Twilio still has no final status after this long
+RECONCILE_GIVE_UP_SECONDS = int(os.getenv("RECONCILE_GIVE_UP_SECONDS", "7200"))
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
@@ -13,6 +22,14 @@ VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "snyKKuaGYk1VUEh42zbW")
 
 BASE_URL = os.getenv("BASE_URL")  
 
+# Extra 8 kHz phone-line variants stored next to each MP3 (see telephony_audio.py)
+TELEPHONY_AUDIO_FORMATS = [
+    f.strip() for f in os.getenv("TELEPHONY_AUDIO_FORMATS", "ulaw_8000").split(",") if f.strip()
+]
+
+# National-format DNC entries (0412...) are read as +<code>412...
+SUPPRESSION_COUNTRY_CODE = os.getenv("SUPPRESSION_COUNTRY_CODE", "61")
+
 
 HUMAN_AGENT_NUMBER = os.getenv("HUMAN_AGENT_NUMBER")
 COMMON_MESSAGE_TEXT = os.getenv("COMMON_MESSAGE_TEXT")
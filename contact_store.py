@@ -0,0 +1,190 @@
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from phones import clean_phone, phone_key
+
+EMPTY = -1
+_HASH_MULT = 0x9E3779B97F4A7C15  # Fibonacci hashing spreads sequential numbers
+
+
+def _signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ContactStore:
+    """
+    Column-oriented contact list for big campaigns.
+
+    Phones are packed into an int64 array, names and clients are interned
+    into lookup tables and referenced by id, and an open-addressing table of
+    row numbers gives O(1) lookups by phone. Roughly 40 bytes per contact
+    plus the distinct name strings, versus a dict + str keys per contact.
+    """
+
+    def __init__(self):
+        self.phones = array("q")
+        self.name_ids = array("l")
+        self.client_ids = array("l")
+        self.names: list[str] = []
+        self.clients: list[str] = []
+        self.slots = array("l", [EMPTY] * 8)
+        self.mask = 7
+        self.rows = 0      # CSV rows with a phone, duplicates included
+        self.skipped = 0   # rows whose Phone is not a usable number
+        self.source = None  # (mtime_ns, size) of the CSV it was built from
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ContactStore":
+        store = cls()
+        name_ids: dict[str, int] = {}
+        client_ids: dict[str, int] = {}
+        row_ids: dict[int, int] = {}  # dedup while loading, replaced by the slot table
+        store.source = _signature(path)
+
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                raw = row.get("Phone", "")
+                key = phone_key(raw)
+                if not key:
+                    store.skipped += bool(raw.strip())
+                    continue
+                name = row.get("Name", "").strip() or "there"
+                client = row.get("Client", "").strip()
+
+                name_id = name_ids.get(name)
+                if name_id is None:
+                    name_id = name_ids[name] = len(store.names)
+                    store.names.append(name)
+                client_id = client_ids.get(client)
+                if client_id is None:
+                    client_id = client_ids[client] = len(store.clients)
+                    store.clients.append(client)
+
+                row = row_ids.get(key)
+                if row is None:
+                    row_ids[key] = len(store.phones)
+                    store.phones.append(key)
+                    store.name_ids.append(name_id)
+                    store.client_ids.append(client_id)
+                else:
+                    # Same phone twice: last row wins, like the old dict did
+                    store.name_ids[row] = name_id
+                    store.client_ids[row] = client_id
+                store.rows += 1
+
+        del row_ids, name_ids, client_ids
+        store._build_index()
+        return store
+
+    def is_current(self, path: str) -> bool:
+        return self.source is not None and os.path.exists(path) and self.source == _signature(path)
+
+    # ─── Hash index ───
+    def _slot(self, key: int) -> int:
+        i = ((key * _HASH_MULT) >> 32) & self.mask
+        slots, phones, mask = self.slots, self.phones, self.mask
+        while True:
+            row = slots[i]
+            if row == EMPTY or phones[row] == key:
+                return i
+            i = (i + 1) & mask
+
+    def _build_index(self):
+        # Keep the table at most half full so probe chains stay short
+        size = 8
+        while size < len(self.phones) * 2:
+            size *= 2
+        self.mask = size - 1
+        slots = array("l", [EMPTY]) * size
+        mask = self.mask
+        # Keys are unique here, so just probe for the first free slot
+        for row, key in enumerate(self.phones):
+            i = ((key * _HASH_MULT) >> 32) & mask
+            while slots[i] != EMPTY:
+                i = (i + 1) & mask
+            slots[i] = row
+        self.slots = slots
+
+    # ─── Lookups ───
+    def _row(self, phone: str) -> int:
+        key = phone_key(phone)
+        if not key:
+            return EMPTY
+        return self.slots[self._slot(key)]
+
+    def get(self, phone: str):
+        """{"name", "client"} for a phone, or None - same shape as the old contact_map."""
+        row = self._row(phone)
+        if row == EMPTY:
+            return None
+        return {
+            "name": self.names[self.name_ids[row]],
+            "client": self.clients[self.client_ids[row]],
+        }
+
+    def __contains__(self, phone: str) -> bool:
+        return self._row(phone) != EMPTY
+
+    def __len__(self) -> int:
+        return len(self.phones)
+
+
+# ─── Benchmark ──────────────
+# python contact_store.py [N]  → memory / load time vs the old dict-of-dicts
+
+def _load_dict_of_dicts(path: str) -> dict:
+    contact_map = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            phone = clean_phone(row.get("Phone", ""))
+            if phone:
+                contact_map[phone] = {
+                    "name": row.get("Name", "").strip() or "there",
+                    "client": row.get("Client", "").strip()
+                }
+    return contact_map
+
+
+def _measure(label: str, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>15}: load {elapsed:6.2f}s, retained {retained / 1e6:7.1f} MB, peak {peak / 1e6:7.1f} MB")
+    return obj
+
+
+def run_benchmark(n: int = 1_000_000, lookups: int = 200_000):
+    rng = random.Random(7)
+    first_names = [f"Name{i}" for i in range(5000)]
+    path = os.path.join(tempfile.mkdtemp(), "contacts.csv")
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Client", "Name", "Phone"])
+        for i in range(n):
+            writer.writerow([f"C{i % 20000:05d}", rng.choice(first_names), f"+614{i:08d}"])
+
+    old = _measure("dict-of-dicts", lambda: _load_dict_of_dicts(path))
+    new = _measure("ContactStore", lambda: ContactStore.from_csv(path))
+    assert len(old) == len(new) == n
+
+    probes = [f"+614{rng.randrange(n):08d}" for _ in range(lookups)]
+    for label, lookup in (("dict-of-dicts", old.get), ("ContactStore", new.get)):
+        start = time.perf_counter()
+        for p in probes:
+            lookup(p)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>15}: {lookups / elapsed:,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,259 @@
+import json
+import os
+import queue
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread, current_thread
+
+import requests
+from twilio.request_validator import RequestValidator
+
+from config import TWILIO_AUTH_TOKEN
+
+
+class WebhookEventProcessor:
+    """
+    Bounded in-process queue between the Twilio webhooks and the slow work.
+
+    Webhooks call submit() and return straight away; a single consumer thread
+    drains the queue in batches and hands each batch to `apply_batch`, so all
+    the file writes / dial triggers for a batch happen once.
+
+    When the queue is full, submit() blocks until there is room (back-pressure
+    on the webhook), warning once it has waited `put_timeout` seconds. Events
+    are never dropped - Twilio does not retry status callbacks - and are
+    always applied in the order they were submitted.
+    """
+
+    def __init__(self, apply_batch, maxsize: int = 1000, batch_size: int = 100, put_timeout: float = 0.5):
+        self.apply_batch = apply_batch
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self.events = queue.Queue(maxsize=maxsize)
+        self.stats_lock = Lock()
+        self.thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.enqueued = 0
+            self.processed = 0
+            self.batches = 0
+            self.failed_batches = 0
+            self.blocked_puts = 0
+            self.blocked_seconds = 0.0
+            self.slow_puts = 0
+            self.max_depth = 0
+            self.last_batch_size = 0
+            self.last_batch_seconds = 0.0
+
+    # ─── Producer side (webhooks) ───
+    def try_submit(self, event: dict) -> bool:
+        """Enqueue without blocking; False if the queue is full."""
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            return False
+        self._count_enqueued()
+        return True
+
+    def submit(self, event: dict):
+        """
+        Enqueue, blocking while the queue is full. Never call this from the
+        event loop - use try_submit() there and fall back to a thread.
+        """
+        if self.try_submit(event):
+            return
+
+        if current_thread() is self.thread:
+            # apply_batch submitting from the consumer: it cannot wait for a
+            # slot only it would free, so queue it past the limit, still in order
+            with self.events.mutex:
+                self.events.queue.append(event)
+                self.events.unfinished_tasks += 1
+                self.events.not_empty.notify()
+            self._count_enqueued()
+            return
+
+        start = time.perf_counter()
+        try:
+            self.events.put(event, timeout=self.put_timeout)
+        except queue.Full:
+            with self.stats_lock:
+                self.slow_puts += 1
+            print(f"[WARN] Webhook queue full for {self.put_timeout}s → still waiting")
+            self.events.put(event)
+        with self.stats_lock:
+            self.blocked_puts += 1
+            self.blocked_seconds += time.perf_counter() - start
+        self._count_enqueued()
+
+    def _count_enqueued(self):
+        depth = self.events.qsize()
+        with self.stats_lock:
+            self.enqueued += 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    # ─── Consumer side ───
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = Thread(target=self._run, name="webhook-events", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 5):
+        """Flush what is queued, then stop the consumer."""
+        if not self.thread:
+            return
+        self.events.put(None)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def join(self):
+        """Block until every queued event has been applied."""
+        self.events.join()
+
+    def _run(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                self.events.task_done()
+                return
+
+            batch = [event]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            self._apply(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self.events.task_done()
+            if stop:
+                return
+
+    def _apply(self, batch: list):
+        start = time.perf_counter()
+        ok = True
+        try:
+            self.apply_batch(batch)
+        except Exception as e:
+            ok = False
+            print(f"[ERROR] Webhook batch of {len(batch)} failed: {e}")
+        elapsed = time.perf_counter() - start
+
+        with self.stats_lock:
+            self.batches += 1
+            self.processed += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_batch_seconds = elapsed
+            if not ok:
+                self.failed_batches += 1
+
+    def stats(self) -> dict:
+        with self.stats_lock:
+            return {
+                "queue_depth": self.events.qsize(),
+                "queue_capacity": self.events.maxsize,
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "avg_batch_size": round(self.processed / self.batches, 2) if self.batches else 0.0,
+                "last_batch_size": self.last_batch_size,
+                "last_batch_ms": round(self.last_batch_seconds * 1000, 2),
+                "blocked_puts": self.blocked_puts,
+                "blocked_seconds": round(self.blocked_seconds, 3),
+                "slow_puts": self.slow_puts,
+            }
+
+
+# ─── Load test ──────────────
+# python event_processor.py                          → in-process, results JSON write per event vs per batch
+# python event_processor.py BASE_URL [N] [THREADS]   → POST N status webhooks at a running server
+#   (signed with TWILIO_AUTH_TOKEN; BASE_URL must match the server's BASE_URL)
+
+def _bench_in_process(n: int = 5000):
+    path = os.path.join(tempfile.mkdtemp(), "call_results.json")
+    results = {}
+
+    def write_results():
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+
+    def apply(batch):
+        for ev in batch:
+            results[ev["phone"]] = {"result": ev["status"]}
+        write_results()
+
+    events = [{"phone": f"+6140000{i:04d}", "status": "completed"} for i in range(n)]
+
+    # Old behaviour: every webhook rewrites the results file before answering
+    results.clear()
+    start = time.perf_counter()
+    for ev in events:
+        apply([ev])
+    inline = time.perf_counter() - start
+    print(f"inline       : {n / inline:>10.0f} webhooks/s")
+
+    results.clear()
+    proc = WebhookEventProcessor(apply, maxsize=1000, batch_size=100)
+    proc.start()
+    start = time.perf_counter()
+    for ev in events:
+        proc.submit(ev)
+    acked = time.perf_counter() - start
+    proc.join()
+    drained = time.perf_counter() - start
+    proc.stop()
+    print(f"write-behind : {n / acked:>10.0f} webhooks/s acknowledged, "
+          f"{n / drained:.0f}/s applied")
+    print(json.dumps(proc.stats(), indent=2))
+
+
+def _bench_http(base_url: str, n: int = 2000, threads: int = 20):
+    session = requests.Session()
+    validator = RequestValidator(TWILIO_AUTH_TOKEN or "")
+    url = f"{base_url}/twilio/status"
+
+    def post(i):
+        data = {
+            "To": f"+6149{i:07d}",
+            "CallStatus": "completed",
+            "CallDuration": "12",
+        }
+        headers = {"X-Twilio-Signature": validator.compute_signature(url, data)}
+        start = time.perf_counter()
+        resp = session.post(url, data=data, headers=headers)
+        resp.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(post, range(n)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{n} webhooks in {elapsed:.2f}s → {n / elapsed:.0f} webhooks/s")
+    print(f"latency p50 {latencies[n // 2] * 1000:.1f} ms, p99 {latencies[int(n * 0.99)] * 1000:.1f} ms")
+    print(session.get(f"{base_url}/webhook-queue-stats").json())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        _bench_http(
+            sys.argv[1].rstrip("/"),
+            int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+            int(sys.argv[3]) if len(sys.argv) > 3 else 20,
+        )
+    else:
+        _bench_in_process()
@@ -4,6 +4,8 @@ from fastapi.staticfiles import StaticFiles
 from twilio.rest import Client
 from fastapi.middleware.cors import CORSMiddleware
 from twilio.twiml.voice_response import VoiceResponse, Gather
+from twilio.request_validator import RequestValidator
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 import csv
 import json
@@ -28,12 +30,26 @@ import bcrypt
 
 
 from config import HUMAN_AGENT_NUMBER, COMMON_MESSAGE_TEXT
+from analytics import CampaignAnalytics
+from event_processor import WebhookEventProcessor
+from contact_store import ContactStore
+from phones import clean_phone, phone_key
+from reconciler import TERMINAL_STATUSES, PendingCalls, TwilioCallsAPI, CallReconciler
+from suppression import SuppressionList
+from telephony_audio import TELEPHONY_PROFILES, ulaw_to_wav, variant_path, pick_smallest_variant
 
 from config import (
     TWILIO_ACCOUNT_SID,
     TWILIO_AUTH_TOKEN,
     TWILIO_PHONE_NUMBER,
     BASE_URL,
+    TELEPHONY_AUDIO_FORMATS,
+    SUPPRESSION_COUNTRY_CODE,
+    TWILIO_API_BASE,
+    RECONCILE_TIMEOUT_SECONDS,
+    RECONCILE_INTERVAL_SECONDS,
+    RECONCILE_MAX_REQUESTS_PER_SECOND,
+    RECONCILE_GIVE_UP_SECONDS,
     ELEVENLABS_API_KEY,
     VOICE_ID,
     SECRET_KEY,
@@ -52,6 +68,7 @@ app.add_middleware(
 )
 
 twilio = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+twilio_validator = RequestValidator(TWILIO_AUTH_TOKEN)
 
 
 
@@ -60,19 +77,25 @@ CONTACTS_CSV     = "contacts.csv"
 RESULTS_JSON     = "call_results.json"
 OUTPUT_CSV_DIR   = "output_results"
 AUDIO_DIR        = "audio"
+SUPPRESSION_DIR  = "suppression"   # do-not-call lists, one number per line
 
 os.makedirs(OUTPUT_CSV_DIR, exist_ok=True)
 os.makedirs(AUDIO_DIR, exist_ok=True)
+os.makedirs(SUPPRESSION_DIR, exist_ok=True)
 app.mount("/audio", StaticFiles(directory=AUDIO_DIR), name="audio")
 
 # ─── ElevenLabs TTS ────
-def generate_audio(text: str, output_path: str):
+def generate_audio(text: str, output_path: str, output_format: str = None):
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}"
     headers = {
         "Accept": "audio/mpeg",
         "Content-Type": "application/json",
         "xi-api-key": ELEVENLABS_API_KEY
     }
+    params = {}
+    if output_format:
+        headers["Accept"] = TELEPHONY_PROFILES[output_format][1]
+        params["output_format"] = output_format
     payload = {
         "text": text,
         "model_id": "eleven_monolingual_v1", 
@@ -81,15 +104,52 @@ def generate_audio(text: str, output_path: str):
             "similarity_boost": 0.75
         }
     }
-    resp = requests.post(url, json=payload, headers=headers)
+    resp = requests.post(url, json=payload, headers=headers, params=params)
     if resp.status_code == 200:
+        content = resp.content
+        # ulaw_8000 comes back as raw samples, Twilio needs a WAV header
+        if output_format == "ulaw_8000":
+            content = ulaw_to_wav(content)
         with open(output_path, "wb") as f:
-            f.write(resp.content)
+            f.write(content)
         print(f"Audio generated: {output_path}")
     else:
         print(f"ElevenLabs failed: {resp.status_code} - {resp.text}")
         raise Exception("TTS generation failed")
 
+def generate_telephony_variants(text: str, mp3_path: str):
+    # Phone-line sized copies next to the MP3; the MP3 stays as the fallback
+    for fmt in TELEPHONY_AUDIO_FORMATS:
+        if fmt not in TELEPHONY_PROFILES:
+            print(f"[WARN] Unknown telephony audio format: {fmt}")
+            continue
+        path = variant_path(mp3_path, fmt)
+        if os.path.exists(path):
+            continue
+        try:
+            generate_audio(text, path, fmt)
+        except Exception as e:
+            print(f"[WARN] Telephony variant {fmt} skipped for {mp3_path}: {e}")
+
+def generate_greeting_audio(text: str, mp3_path: str):
+    # Per-contact greetings: one TTS request in the first telephony format that
+    # works, the full MP3 only if none does (static assets keep both)
+    variants = [variant_path(mp3_path, fmt) for fmt in TELEPHONY_AUDIO_FORMATS if fmt in TELEPHONY_PROFILES]
+    if os.path.exists(mp3_path) or any(os.path.exists(p) for p in variants):
+        return
+    for fmt in TELEPHONY_AUDIO_FORMATS:
+        if fmt not in TELEPHONY_PROFILES:
+            continue
+        try:
+            generate_audio(text, variant_path(mp3_path, fmt), fmt)
+            return
+        except Exception as e:
+            print(f"[WARN] Telephony greeting {fmt} failed for {mp3_path}: {e}")
+    generate_audio(text, mp3_path)
+
+def audio_url(base: str) -> str:
+    return f"{BASE_URL}/audio/{pick_smallest_variant(AUDIO_DIR, base, TELEPHONY_AUDIO_FORMATS)}"
+
 # ─── Pre-generate static / common audio files ─────────────────
 COMMON_MESSAGE_PATH = os.path.join(AUDIO_DIR, "common_message_v3.mp3")
 
@@ -103,6 +163,7 @@ if not os.path.exists(COMMON_MESSAGE_PATH):
     print("Common message audio created.")
 else:
     print("Common message audio already exists → skipping generation.")
+generate_telephony_variants(COMMON_TEXT, COMMON_MESSAGE_PATH)
 
 # Other static phrases
 static_texts = {
@@ -114,6 +175,11 @@ for key, txt in static_texts.items():
     path = os.path.join(AUDIO_DIR, f"{key}.mp3")
     if not os.path.exists(path):
         generate_audio(txt, path)
+    generate_telephony_variants(txt, path)
+
+# Bounded queue between the Twilio webhooks and the result writer
+WEBHOOK_QUEUE_SIZE = 1000
+WEBHOOK_BATCH_SIZE = 100
 
 # Queue for sequential calling
 call_queue = queue.Queue()
@@ -133,10 +199,18 @@ def start_next_call():
         is_calling = True
 
     try:
-        phone, name, client_id = call_queue.get_nowait()
+        while True:
+            phone, name, client_id = call_queue.get_nowait()
+            # Lists can be reloaded mid-campaign, so check again right before dialling
+            if not dnc.contains(phone, stage="dial"):
+                break
+            print(f"[DNC] Skipping suppressed number: {phone}")
+            # Recorded and counted by the consumer, which does not dial for it
+            webhook_events.submit({"type": "suppressed", "phone": phone, "received_at": datetime.now()})
+
         print(f"[OUT] Calling: {phone} ({name}) - Client: {client_id}")
 
-        twilio.calls.create(
+        call = twilio.calls.create(
             to=phone,
             from_=TWILIO_PHONE_NUMBER,
             # url=f"{BASE_URL}/twilio/voice?client={client_id}",
@@ -145,6 +219,7 @@ def start_next_call():
             # status_callback_event=["completed"],
             status_callback_event=["initiated", "ringing", "answered", "completed"],
         )
+        pending_calls.track(call.sid, phone)
     except queue.Empty:
         pass
     finally:
@@ -162,42 +237,38 @@ call_tracker = {
     "lock": Lock()
 }
 
-contact_map: dict[str, dict] = {}
+# Built once per upload; phone → {"name", "client"} for the webhooks
+contacts = ContactStore()
+
+# Dialled calls still waiting for a terminal status (see reconciler.py)
+pending_calls = PendingCalls()
+
+# Do-not-call / internal suppression lists from SUPPRESSION_DIR
+dnc = SuppressionList(SUPPRESSION_DIR, default_country_code=SUPPRESSION_COUNTRY_CODE)
+
+# Outcome / rate / duration rollups, fed by the status callbacks
+campaign_stats = CampaignAnalytics()
 
 def normalize_phone(p: str) -> str:
     if not p:
         return ""
-    cleaned = ''.join(c for c in str(p).strip() if c.isdigit() or c == '+')
-    if cleaned.count('+') > 1:
-        cleaned = '+' + cleaned.replace('+', '')
-    if not cleaned.startswith('+'):
-        cleaned = '+' + cleaned
-    if cleaned.startswith('+88') and len(cleaned) == 13 and cleaned[3] != '0':
-        cleaned = '+880' + cleaned[3:]
+    cleaned = clean_phone(p)
     print(f"Normalized: '{p}' → '{cleaned}'")
     return cleaned
 
 def load_contacts_to_memory():
-    global contact_map
-    contact_map.clear()
+    global contacts
     if not os.path.exists(CONTACTS_CSV):
+        contacts = ContactStore()
         return 0
-    count = 0
-    with open(CONTACTS_CSV, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            phone = normalize_phone(row.get("Phone", ""))
-            if phone:
-                contact_map[phone] = {
-                    "name": row.get("Name", "").strip() or "there",
-                    "client": row.get("Client", "").strip()
-                }
-                print(f"Stored contact: {phone} → {contact_map[phone]}")
-                count += 1
-    return count
+    contacts = ContactStore.from_csv(CONTACTS_CSV)
+    print(f"Stored contacts: {len(contacts)} unique phones from {contacts.rows} rows")
+    if contacts.skipped:
+        print(f"[WARN] Skipped {contacts.skipped} contact(s) without a usable phone number")
+    return contacts.rows
 
 # Utils
-def save_result(phone: str, name: str, result: str):
+def load_results() -> dict:
     results = {}
     if os.path.exists(RESULTS_JSON):
         try:
@@ -205,21 +276,27 @@ def save_result(phone: str, name: str, result: str):
                 results = json.load(f)
         except:
             pass
+    return results
+
+def write_results(results: dict):
+    # Write aside and swap in, so a crash mid-write never leaves a truncated file
+    tmp_path = RESULTS_JSON + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, RESULTS_JSON)
 
+def apply_result(results: dict, phone: str, name: str, result: str, when: datetime = None) -> bool:
     # DO NOT overwrite a transfer
     if results.get(phone, {}).get("result") == "successfully_transferred":
-        return
+        return False
 
     results[phone] = {
         "name": name,
         "phone": phone,
         "result": result,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "timestamp": (when or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
     }
-
-    with open(RESULTS_JSON, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
-
+    return True
 
 def generate_final_output_csv():
     if not os.path.exists(CONTACTS_CSV):
@@ -263,6 +340,23 @@ def generate_final_output_csv():
 # def serve_home():
 #     return FileResponse("index.html")
 
+def save_contacts(reader: csv.DictReader):
+    # Picks up changed DNC files first; suppressed rows never reach contacts.csv
+    dnc.reload()
+    dnc.reset_hits()
+
+    suppressed = 0
+    with open(CONTACTS_CSV, "w", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=reader.fieldnames)
+        writer.writeheader()
+        for row in reader:
+            if dnc.contains(row.get("Phone") or "", stage="upload"):
+                suppressed += 1
+                continue
+            writer.writerow({k: (v or "").strip() for k, v in row.items()})
+
+    return load_contacts_to_memory(), suppressed
+
 @app.post("/upload-contacts")
 async def upload_contacts(file: UploadFile):
     content = (await file.read()).decode('utf-8').splitlines()
@@ -272,34 +366,37 @@ async def upload_contacts(file: UploadFile):
     if not required.issubset(reader.fieldnames or []):
         return {"error": f"Missing columns: {required - set(reader.fieldnames or [])}"}
 
-    with open(CONTACTS_CSV, "w", newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=reader.fieldnames)
-        writer.writeheader()
-        for row in reader:
-            writer.writerow({k: (v or "").strip() for k, v in row.items()})
+    # Rewriting and indexing a million-row list takes seconds; keep it off the
+    # event loop so the Twilio webhooks are still answered meanwhile
+    count, suppressed = await run_in_threadpool(save_contacts, reader)
 
     if os.path.exists(RESULTS_JSON):
         os.remove(RESULTS_JSON)
 
-    count = load_contacts_to_memory()
-
     with call_tracker["lock"]:
         call_tracker.update({"total": 0, "completed": 0, "running": False})
 
-    return {"message": "Contacts uploaded", "count": count}
+    campaign_stats.reset()
+    pending_calls.clear()
+
+    return {"message": "Contacts uploaded", "count": count, "suppressed": suppressed}
 
 @app.post("/start-calls")
 def start_calls(background_tasks: BackgroundTasks):
     global stop_requested
     stop_requested = False
 
+    # Picks up new / changed DNC files; unchanged ones are not re-read
+    dnc.reload()
+
     with call_tracker["lock"]:
         if call_tracker["running"]:
             return {"error": "Already running"}
         if not os.path.exists(CONTACTS_CSV):
             return {"error": "Upload contacts first"}
 
-        count = load_contacts_to_memory()
+        # Only rebuild if contacts.csv changed since it was loaded (e.g. after a restart)
+        count = contacts.rows if contacts.is_current(CONTACTS_CSV) else load_contacts_to_memory()
         if count == 0:
             return {"error": "No contacts"}
 
@@ -307,6 +404,9 @@ def start_calls(background_tasks: BackgroundTasks):
         call_tracker["completed"] = 0
         call_tracker["running"] = True
 
+    # A re-run on the same upload starts its rollups from zero too
+    campaign_stats.reset()
+
     background_tasks.add_task(run_outbound_calls)
     return {"status": "started", "total": count}
 
@@ -325,13 +425,12 @@ def run_outbound_calls():
                 name = row.get("Name", "").strip() or "there"
                 client = row.get("Client", "").strip()
 
-                if phone and client:
+                # Same rows the contact store kept (see ContactStore.from_csv)
+                if phone_key(phone) and client:
                     # Generate hello audio per PHONE (not client)
                     hello_path = os.path.join(AUDIO_DIR, f"hello_{phone}_v3.mp3")
 
-                    if not os.path.exists(hello_path):
-                        hello_text = f"Hello {name},"
-                        generate_audio(hello_text, hello_path)
+                    generate_greeting_audio(f"Hello {name},", hello_path)
 
                     call_queue.put((phone, name, client))
 
@@ -374,10 +473,10 @@ async def twilio_voice(request: Request):
         return Response(str(vr), media_type="application/xml")
 
     # 1) Say name first
-    vr.play(f"{BASE_URL}/audio/hello_{phone}_v3.mp3")
+    vr.play(audio_url(f"hello_{phone}_v3"))
 
     # 2) Play full script (no gather here)
-    vr.play(f"{BASE_URL}/audio/common_message_v3.mp3")
+    vr.play(audio_url("common_message_v3"))
 
     # 3) NOW gather — Twilio will pass speech said earlier too
     gather = Gather(
@@ -392,7 +491,7 @@ async def twilio_voice(request: Request):
     vr.append(gather)
 
     # 4) If nothing was said at all
-    vr.play(f"{BASE_URL}/audio/thank_you_goodbye_v3.mp3")
+    vr.play(audio_url("thank_you_goodbye_v3"))
 
     return Response(str(vr), media_type="application/xml")
 
@@ -401,6 +500,8 @@ async def twilio_voice(request: Request):
 @app.post("/twilio/transfer")
 async def transfer_call(request: Request):
     form = await request.form()
+    if not is_valid_twilio_request(request, form):
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
     phone_raw = request.query_params.get("phone")
     phone = normalize_phone(phone_raw)
@@ -408,9 +509,6 @@ async def transfer_call(request: Request):
     digits = form.get("Digits")
     speech = (form.get("SpeechResult") or "").lower()
 
-    contact = contact_map.get(phone)
-    name = contact["name"] if contact else "customer"
-
     wants_transfer = (
         digits == "1" or
         any(w in speech for w in [
@@ -421,62 +519,153 @@ async def transfer_call(request: Request):
 
     vr = VoiceResponse()
 
-    if wants_transfer:
-        save_result(phone, name, "successfully_transferred")
-        vr.play(f"{BASE_URL}/audio/please_hold_v3.mp3") 
+    if wants_transfer and phone:
+        await enqueue_webhook_event({"type": "transfer", "phone": phone, "received_at": datetime.now()})
+        vr.play(audio_url("please_hold_v3")) 
         vr.dial(HUMAN_AGENT_NUMBER)
     else:
-        vr.play(f"{BASE_URL}/audio/thank_you_goodbye_v3.mp3") 
+        vr.play(audio_url("thank_you_goodbye_v3")) 
 
     return Response(str(vr), media_type="application/xml")
 
 
 
+def is_valid_twilio_request(request: Request, form) -> bool:
+    # Twilio signs the public URL it called (BASE_URL), not the one uvicorn sees behind ngrok
+    url = f"{BASE_URL.rstrip('/')}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    signature = request.headers.get("X-Twilio-Signature", "")
+    return twilio_validator.validate(url, dict(form), signature)
+
+
+async def enqueue_webhook_event(event: dict):
+    # Normal case never leaves the event loop; when the queue is full the
+    # blocking put runs in the threadpool so other requests keep flowing
+    if not webhook_events.try_submit(event):
+        await run_in_threadpool(webhook_events.submit, event)
+
+
 @app.post("/twilio/status")
 async def call_status(request: Request):
     form = await request.form()
+    if not is_valid_twilio_request(request, form):
+        raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
     phone_raw = form.get("To") or form.get("Called") or form.get("From")
     phone = normalize_phone(phone_raw)
 
     status = form.get("CallStatus")
-    duration = int(form.get("CallDuration") or 0)
+    try:
+        duration = int(form.get("CallDuration") or 0)
+    except ValueError:
+        duration = 0
 
     print(f"STATUS → {phone_raw} → {phone} | {status} | {duration}s")
 
-    contact = contact_map.get(phone)
-    if not contact:
-        print(f"[WARN] No contact found for {phone_raw}")
+    if not phone or not status:
+        print(f"[WARN] Ignoring status callback without phone/status: {dict(form)}")
         return "ok"
 
-    name = contact["name"]
+    # Everything else happens on the webhook event consumer
+    await enqueue_webhook_event({
+        "type": "status",
+        "sid": form.get("CallSid"),
+        "phone": phone,
+        "status": status,
+        "duration": duration,
+        "received_at": datetime.now(),
+    })
+    return "ok"
 
-    # ── check if already transferred ──
-    already_transferred = False
-    if os.path.exists(RESULTS_JSON):
-        try:
-            with open(RESULTS_JSON, "r", encoding="utf-8") as f:
-                results = json.load(f)
-                if results.get(phone, {}).get("result") == "successfully_transferred":
-                    print("Already transferred, skip overwrite")
-                    already_transferred = True
-        except:
-            pass
-     # ── save result only if not transferred ──
-    if not already_transferred:
-        if status == "no-answer":
-            save_result(phone, name, "no_answer")
-        elif status == "busy":
-            save_result(phone, name, "busy")
-        elif status in ["failed", "canceled"]:
-            save_result(phone, name, status)
-        elif status == "completed":
-            save_result(phone, name, "answered_no_transfer")
 
+def status_outcome(status: str):
+    if status == "no-answer":
+        return "no_answer"
+    elif status == "busy":
+        return "busy"
+    elif status in ["failed", "canceled"]:
+        return status
+    elif status == "completed":
+        return "answered_no_transfer"
+    return None
+
+
+def apply_webhook_batch(batch: list):
+    """
+    Apply a batch of queued webhook events in one go: call_results.json is
+    read and written once, progress is bumped once and the next call is
+    dialled once, however many callbacks arrived together.
+    """
+    results = load_results()
+    changed = False
+    counted = 0
+    calls_ended = 0
+
+    for event in batch:
+        phone = event["phone"]
+        contact = contacts.get(phone)
+
+        if event["type"] == "transfer":
+            name = contact["name"] if contact else "customer"
+            changed |= apply_result(results, phone, name, "successfully_transferred", event["received_at"])
+            continue
+
+        if event["type"] == "suppressed":
+            # Dropped right before dialling; still counts towards progress, but
+            # start_next_call() already moved on to the next number, so it must
+            # not trigger another dial (that would run two calls at once)
+            name = contact["name"] if contact else ""
+            changed |= apply_result(results, phone, name, "suppressed", event["received_at"])
+            counted += 1
+            continue
+
+        # initiated / ringing / answered: nothing to record yet
+        if event["status"] not in TERMINAL_STATUSES:
+            continue
+
+        # Read before finish() forgets it: rollups are bucketed by dial time, not
+        # by when the callback (or a reconciler sweep, possibly hours later) landed
+        dialled_at = pending_calls.started_at(event["sid"]) if event.get("sid") else None
+
+        # Already settled by the reconciler (or a duplicate callback) → don't count twice
+        if event.get("sid") and not pending_calls.finish(event["sid"]):
+            print(f"Late/duplicate final status for {event['sid']}, skipping")
+            continue
+
+        if not contact:
+            print(f"[WARN] No contact found for {phone}")
+            continue
+
+        # ── check if already transferred ──
+        already_transferred = results.get(phone, {}).get("result") == "successfully_transferred"
+        if already_transferred:
+            print("Already transferred, skip overwrite")
+
+        outcome = status_outcome(event["status"])
+
+        # ── save result only if not transferred ──
+        if outcome and not already_transferred:
+            changed |= apply_result(results, phone, contact["name"], outcome, event["received_at"])
+
+        # ── roll the final outcome into the campaign analytics ──
+        if outcome:
+            final = "successfully_transferred" if already_transferred else outcome
+            when = datetime.fromtimestamp(dialled_at) if dialled_at else event["received_at"]
+            campaign_stats.record(final, contact["client"], event["duration"], when)
+
+        counted += 1
+        calls_ended += 1
+
+    if changed:
+        write_results(results)
+
+    if not counted:
+        return
 
     # ── ALWAYS count & continue ──
     with call_tracker["lock"]:
-        call_tracker["completed"] += 1
+        call_tracker["completed"] += counted
         done = call_tracker["completed"]
         total = call_tracker["total"]
         print(f"Progress: {done}/{total}")
@@ -487,8 +676,91 @@ async def call_status(request: Request):
             # call_tracker.update(total=0, completed=0, running=False)
             call_tracker["running"] = False
 
-    start_next_call()
-    return "ok"
+    # Only a call that actually ended frees the line for the next one
+    if calls_ended:
+        start_next_call()
+
+
+# Webhooks only validate + enqueue; this applies them in the background
+webhook_events = WebhookEventProcessor(
+    apply_webhook_batch,
+    maxsize=WEBHOOK_QUEUE_SIZE,
+    batch_size=WEBHOOK_BATCH_SIZE,
+)
+
+
+@app.on_event("startup")
+async def start_webhook_events():
+    webhook_events.start()
+
+
+@app.on_event("shutdown")
+async def stop_webhook_events():
+    webhook_events.stop()
+
+
+@app.get("/webhook-queue-stats")
+def webhook_queue_stats():
+    return webhook_events.stats()
+
+
+def reconciled_status(sid: str, phone: str, status: str, duration: int):
+    # Same event a real status callback would have produced
+    webhook_events.submit({
+        "type": "status",
+        "sid": sid,
+        "phone": phone,
+        "status": status,
+        "duration": duration,
+        "received_at": datetime.now(),
+    })
+
+
+# Settles calls whose final status callback was lost or is very late
+call_reconciler = CallReconciler(
+    pending_calls,
+    TwilioCallsAPI(
+        TWILIO_ACCOUNT_SID,
+        TWILIO_AUTH_TOKEN,
+        api_base=TWILIO_API_BASE,
+        from_number=TWILIO_PHONE_NUMBER,
+        max_requests_per_second=RECONCILE_MAX_REQUESTS_PER_SECOND,
+    ),
+    reconciled_status,
+    timeout=RECONCILE_TIMEOUT_SECONDS,
+    interval=RECONCILE_INTERVAL_SECONDS,
+    give_up_after=RECONCILE_GIVE_UP_SECONDS,
+)
+
+
+@app.on_event("startup")
+async def start_call_reconciler():
+    call_reconciler.start()
+
+
+@app.on_event("shutdown")
+async def stop_call_reconciler():
+    call_reconciler.stop()
+
+
+@app.get("/reconciler-stats")
+def reconciler_stats():
+    return call_reconciler.stats()
+
+
+@app.on_event("startup")
+def load_suppression_lists():
+    dnc.reload()
+
+
+@app.post("/suppression/reload")
+def reload_suppression():
+    return dnc.reload()
+
+
+@app.get("/suppression-stats")
+def suppression_stats():
+    return dnc.stats()
 
 @app.get("/result-csv")
 def result_csv():
@@ -527,6 +799,12 @@ def call_progress():
         }
 
 
+@app.get("/analytics")
+def analytics():
+    # Served straight from the rollups, no results history is read here
+    return campaign_stats.snapshot()
+
+
 
 
 # --- SQLite Setup ---
@@ -0,0 +1,41 @@
+# E.164 caps numbers at 15 digits, which also keeps every key inside an int64
+MAX_PHONE_DIGITS = 15
+
+
+def clean_phone(p: str) -> str:
+    """Normalise a phone number to +<digits> (no logging, safe for bulk loads)."""
+    if not p:
+        return ""
+    raw = str(p).strip()
+    if raw.isdigit() or (raw[:1] == '+' and raw[1:].isdigit()):
+        cleaned = raw  # already only digits / one leading +, same as the filter below
+    else:
+        cleaned = ''.join(c for c in raw if c.isdigit() or c == '+')
+    if cleaned.count('+') > 1:
+        cleaned = '+' + cleaned.replace('+', '')
+    if not cleaned.startswith('+'):
+        cleaned = '+' + cleaned
+    if cleaned.startswith('+88') and len(cleaned) == 13 and cleaned[3] != '0':
+        cleaned = '+880' + cleaned[3:]
+    return cleaned
+
+
+def phone_to_int(phone: str) -> int:
+    """
+    Pack a cleaned +<digits> number into an int; 0 if there are no digits or
+    more than MAX_PHONE_DIGITS (an ID column, two numbers in one cell...).
+    """
+    digits = phone.lstrip('+')
+    if not digits.isdigit() or len(digits) > MAX_PHONE_DIGITS:
+        return 0
+    return int(digits)
+
+
+def phone_key(p: str) -> int:
+    """
+    Lookup key shared by the contact store and the suppression lists.
+
+    Always goes through clean_phone() so every number gets the same rewrites
+    (e.g. +88 → +880) as the ones the dialer and webhooks use.
+    """
+    return phone_to_int(clean_phone(p))
@@ -0,0 +1,382 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+TERMINAL_STATUSES = {"completed", "busy", "no-answer", "failed", "canceled"}
+
+# Recently settled SIDs kept to drop late / duplicate callbacks; the dialer is
+# sequential, so anything older than this many calls will not call back again
+FINISHED_MEMORY = 10_000
+
+
+class PendingCalls:
+    """Calls we dialled that have not had a terminal status yet (sid → phone)."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.calls: dict[str, dict] = {}
+        self.finished: OrderedDict[str, None] = OrderedDict()
+
+    def track(self, sid: str, phone: str):
+        with self.lock:
+            self.calls[sid] = {"phone": phone, "started_at": time.time()}
+
+    def started_at(self, sid: str):
+        """When a still-pending call was dialled (epoch seconds), else None."""
+        with self.lock:
+            call = self.calls.get(sid)
+            return call["started_at"] if call else None
+
+    def finish(self, sid: str) -> bool:
+        """
+        Mark a call terminal. False if it was already finished, so a late
+        callback after a reconciliation (or a duplicate) is not counted twice.
+        """
+        with self.lock:
+            if sid in self.finished:
+                return False
+            self.finished[sid] = None
+            if len(self.finished) > FINISHED_MEMORY:
+                self.finished.popitem(last=False)
+            self.calls.pop(sid, None)
+            return True
+
+    def overdue(self, timeout: float) -> dict:
+        cutoff = time.time() - timeout
+        with self.lock:
+            return {sid: dict(c) for sid, c in self.calls.items() if c["started_at"] <= cutoff}
+
+    def clear(self):
+        with self.lock:
+            self.calls.clear()
+            self.finished.clear()
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+
+class TwilioCallsAPI:
+    """
+    Minimal client for the Twilio Calls REST resource.
+
+    Talks to `api_base` with plain requests so it can be pointed at a local
+    fake; every request goes through a simple rate limiter.
+    """
+
+    def __init__(self, account_sid: str, auth_token: str, api_base: str = "https://api.twilio.com",
+                 from_number: str = None, page_size: int = 100, max_requests_per_second: float = 2.0):
+        self.account_sid = account_sid
+        self.from_number = from_number
+        self.api_base = api_base.rstrip("/")
+        self.page_size = page_size
+        self.min_interval = 1.0 / max_requests_per_second if max_requests_per_second > 0 else 0
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+        self.last_request = 0.0
+        self.requests_made = 0
+
+    def _get(self, path: str, params: dict = None) -> dict:
+        wait = self.last_request + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_request = time.monotonic()
+        self.requests_made += 1
+
+        resp = self.session.get(f"{self.api_base}{path}", params=params, timeout=30)
+        resp.raise_for_status()
+        return resp.json()
+
+    def iter_calls(self, started_after: datetime):
+        """Our outbound calls started on/after the given day, following next_page_uri."""
+        path = f"/2010-04-01/Accounts/{self.account_sid}/Calls.json"
+        params = {"StartTime>": started_after.strftime("%Y-%m-%d"), "PageSize": self.page_size}
+        if self.from_number:
+            # Only the dialer's own calls, not the whole account's log
+            params["From"] = self.from_number
+        while path:
+            page = self._get(path, params)
+            yield from page.get("calls", [])
+            # next_page_uri already carries the filters and page token
+            path, params = page.get("next_page_uri"), None
+
+    def fetch_call(self, sid: str) -> dict:
+        return self._get(f"/2010-04-01/Accounts/{self.account_sid}/Calls/{sid}.json")
+
+
+class CallReconciler:
+    """
+    Background sweep for calls whose terminal status callback never arrived.
+
+    Every `interval` seconds, calls pending for longer than `timeout` are
+    looked up: one by one when there are only a few (the usual case with the
+    sequential dialer), otherwise in bulk from the Calls list (paged, rate
+    limited) with per-call fetches for the leftovers. Terminal ones are
+    handed to `on_status(sid, phone, status, duration)`, i.e. the same path a
+    real status callback takes. Calls Twilio does not know (404), or that
+    still have no final status after `give_up_after`, are settled as
+    "failed" so the campaign can still finish.
+    """
+
+    def __init__(self, pending: PendingCalls, api: TwilioCallsAPI, on_status,
+                 timeout: float = 300, interval: float = 60, give_up_after: float = 7200,
+                 direct_fetch_max: int = 5):
+        self.pending = pending
+        self.api = api
+        self.on_status = on_status
+        self.timeout = timeout
+        self.interval = interval
+        self.give_up_after = give_up_after
+        self.direct_fetch_max = direct_fetch_max
+        self.stop_event = Event()
+        self.thread = None
+        self.sweeps = 0
+        self.reconciled = 0
+        self.given_up = 0
+        self.last_error = None
+
+    def sweep(self) -> int:
+        overdue = self.pending.overdue(self.timeout)
+        if not overdue:
+            return 0
+
+        found = {}
+        if len(overdue) > self.direct_fetch_max:
+            oldest = min(c["started_at"] for c in overdue.values())
+            # Date-granular filter; go back a day so calls around midnight UTC are included
+            started_after = datetime.fromtimestamp(oldest, tz=timezone.utc) - timedelta(days=1)
+            try:
+                for call in self.api.iter_calls(started_after):
+                    if call.get("sid") in overdue:
+                        found[call["sid"]] = call
+                        if len(found) == len(overdue):
+                            break
+            except requests.RequestException as e:
+                # Keep whatever pages came back; the rest is fetched one by one below
+                print(f"[RECONCILE] Listing calls failed, fetching by SID: {e}")
+
+        unknown = set()
+        for sid in overdue.keys() - found.keys():
+            try:
+                found[sid] = self.api.fetch_call(sid)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    unknown.add(sid)
+                else:
+                    print(f"[RECONCILE] Could not fetch {sid}: {e}")
+            except requests.RequestException as e:
+                print(f"[RECONCILE] Could not fetch {sid}: {e}")
+
+        now = time.time()
+        reconciled = 0
+        for sid, pending in overdue.items():
+            status = found.get(sid, {}).get("status")
+            duration = int(found.get(sid, {}).get("duration") or 0)
+            if sid in unknown:
+                print(f"[RECONCILE] {sid} unknown to Twilio → failed")
+                status, duration = "failed", 0
+                self.given_up += 1
+            elif status not in TERMINAL_STATUSES:
+                if now - pending["started_at"] < self.give_up_after:
+                    continue  # still ringing / in progress, check again next sweep
+                print(f"[RECONCILE] {sid} no final status after {self.give_up_after:.0f}s → failed")
+                status = "failed"
+                self.given_up += 1
+
+            print(f"[RECONCILE] {sid} → {pending['phone']} | {status}")
+            self.on_status(sid, pending["phone"], status, duration)
+            reconciled += 1
+
+        self.reconciled += reconciled
+        return reconciled
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sweep()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"[RECONCILE] Sweep failed: {e}")
+            self.sweeps += 1
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, name="call-reconciler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(5)
+            self.thread = None
+
+    def stats(self) -> dict:
+        return {
+            "pending_calls": len(self.pending),
+            "overdue_calls": len(self.pending.overdue(self.timeout)),
+            "sweeps": self.sweeps,
+            "reconciled": self.reconciled,
+            "given_up": self.given_up,
+            "api_requests": self.api.requests_made,
+            "last_error": self.last_error,
+        }
+
+
+# ─── Local fake of the Twilio Calls API ──────────────
+# python reconciler.py → runs sweeps against an in-process fake, prints what
+# would be fed back into the outcome path and asserts the expected results.
+# Set TWILIO_API_BASE to the fake's URL to exercise the running app the same way.
+
+class FakeTwilioCalls:
+    def __init__(self, calls: list, page_size_cap: int = 50):
+        self.calls = calls
+        self.page_size_cap = page_size_cap
+        self.fail_list = False  # list endpoint answers 500, like a Twilio outage
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append(self.path)
+                url = urlparse(self.path)
+                qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+                parts = url.path.split("/")
+
+                if url.path.endswith("/Calls.json"):
+                    if fake.fail_list:
+                        self.send_response(500)
+                        self.end_headers()
+                        return
+                    body = fake.page(url.path, qs)
+                else:
+                    sid = parts[-1][:-len(".json")]
+                    body = next((c for c in fake.calls if c["sid"] == sid), None)
+                    if body is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def page(self, path: str, qs: dict) -> dict:
+        calls = self.calls
+        if qs.get("From"):
+            calls = [c for c in calls if c.get("from") == qs["From"]]
+        size = min(int(qs.get("PageSize", 50)), self.page_size_cap)
+        page = int(qs.get("Page", 0))
+        chunk = calls[page * size:(page + 1) * size]
+        more = (page + 1) * size < len(calls)
+        query = urlencode({k: v for k, v in {"From": qs.get("From"), "PageSize": size, "Page": page + 1}.items() if v})
+        return {
+            "calls": chunk,
+            "page": page,
+            "page_size": size,
+            "next_page_uri": f"{path}?{query}" if more else None,
+        }
+
+    def close(self):
+        self.server.shutdown()
+
+
+def _demo():
+    dialer = "+61200000000"
+    statuses = ["completed", "no-answer", "busy", "in-progress"]
+    calls = [
+        {"sid": f"CA{i:032d}", "from": dialer if i % 2 else "+61300000000", "to": f"+614{i:08d}",
+         "status": statuses[i % 4], "duration": str(i % 90)}
+        for i in range(500)
+    ]
+    fake = FakeTwilioCalls(calls)
+
+    def run(label, tracked, age: float = 0):
+        pending = PendingCalls()
+        for sid, phone in tracked:
+            pending.track(sid, phone)
+            pending.calls[sid]["started_at"] -= age
+        api = TwilioCallsAPI("AC" + "0" * 32, "token", api_base=fake.url, from_number=dialer,
+                             page_size=100, max_requests_per_second=0)
+        fed = []
+
+        def on_status(sid, phone, status, duration):
+            # What apply_webhook_batch does: only the first final status counts
+            if pending.finish(sid):
+                fed.append((sid, phone, status, duration))
+
+        reconciler = CallReconciler(pending, api, on_status, timeout=0)
+        start = time.perf_counter()
+        reconciler.sweep()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: settled {len(fed)} of {len(tracked)} overdue calls "
+              f"({reconciler.given_up} as failed, {len(pending)} still in progress) "
+              f"with {api.requests_made} API requests in {elapsed * 1000:.0f} ms")
+        for args in fed[:3]:
+            print("  ", args)
+        return reconciler, pending, dict((f[0], f) for f in fed)
+
+    ours = [c for c in calls if c["from"] == dialer]
+    unknown = ("CA" + "f" * 32, "+61499999999")  # 404 → settled as failed
+    bulk = [(c["sid"], c["to"]) for c in ours[::5]] + [unknown]
+    live = sum(1 for c in ours[::5] if c["status"] == "in-progress")
+
+    # Few overdue calls: fetched by SID, the unknown one settled as failed
+    reconciler, pending, fed = run("single call", [(ours[0]["sid"], ours[0]["to"]), unknown])
+    assert reconciler.api.requests_made == 2
+    assert fed[ours[0]["sid"]][2:] == (ours[0]["status"], int(ours[0]["duration"]))
+    assert fed[unknown[0]][2] == "failed" and reconciler.given_up == 1
+    assert len(pending) == 0
+
+    # Many: one filtered list scan, per-SID fetch only for the leftovers
+    reconciler, pending, fed = run("bulk", bulk)
+    assert len(fed) == len(bulk) - live and len(pending) == live
+    assert fed[unknown[0]][2] == "failed" and reconciler.given_up == 1
+    assert all(c["status"] == fed[c["sid"]][2] for c in ours[::5] if c["sid"] in fed)
+
+    # A late / duplicate callback for a settled call is not counted again,
+    # while an in-progress one is settled when its callback finally arrives
+    assert not pending.finish(unknown[0])
+    assert pending.finish(next(iter(pending.calls)))
+
+    # List endpoint down: falls back to fetching every overdue call by SID
+    fake.fail_list = True
+    reconciler, pending, fed = run("list failing", bulk)
+    assert len(fed) == len(bulk) - live and len(pending) == live
+    fake.fail_list = False
+
+    # Past give_up_after without a final status: settled as failed too
+    reconciler, pending, fed = run("stuck calls", bulk, age=7200)
+    assert len(fed) == len(bulk) and len(pending) == 0
+    assert reconciler.given_up == live + 1
+    assert all(fed[c["sid"]][2] == "failed" for c in ours[::5] if c["status"] == "in-progress")
+
+    # Settled SIDs are only remembered up to FINISHED_MEMORY
+    pending = PendingCalls()
+    for i in range(FINISHED_MEMORY + 10):
+        pending.finish(f"CA{i}")
+    assert len(pending.finished) == FINISHED_MEMORY and pending.finish("CA0")
+
+    fake.close()
+    print("All reconciler checks passed")
+
+
+if __name__ == "__main__":
+    _demo()
@@ -0,0 +1,195 @@
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+from threading import Lock
+
+from phones import phone_key
+
+SUPPRESSION_EXTENSIONS = (".csv", ".txt")
+
+# Numbers are sorted in chunks of this size and merged, so loading peaks at
+# ~16 bytes per number plus one chunk instead of a full list of Python ints
+LOAD_CHUNK = 1 << 18
+
+
+def dnc_key(raw: str, default_country_code: str = "") -> int:
+    """
+    Integer key for a do-not-call entry.
+
+    Registers usually publish national numbers (0412 345 678); with a default
+    country code those are turned into the same +61412345678 form the
+    contacts use before packing.
+    """
+    raw = raw.strip()
+    if default_country_code and raw.startswith("0"):
+        raw = "+" + default_country_code + raw[1:]
+    return phone_key(raw)
+
+
+def _merge_unique(chunks: list) -> array:
+    out = array("q")
+    last = None
+    for k in heapq.merge(*chunks):
+        if k != last:
+            out.append(k)
+            last = k
+    return out
+
+
+def load_dnc_file(path: str, default_country_code: str = "") -> array:
+    """Read one number per line (first CSV column), skipping headers/blanks."""
+    chunks = []
+    pending = []
+    skipped = 0
+    with open(path, newline="", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            key = dnc_key(line.split(",", 1)[0], default_country_code)
+            if not key:
+                skipped += bool(line.strip())
+                continue
+            pending.append(key)
+            if len(pending) >= LOAD_CHUNK:
+                pending.sort()
+                chunks.append(array("q", pending))
+                pending = []
+    if skipped:
+        print(f"[DNC] {os.path.basename(path)}: skipped {skipped} line(s) without a usable number")
+    if pending:
+        pending.sort()
+        chunks.append(array("q", pending))
+    del pending
+    return _merge_unique(chunks)
+
+
+class SuppressionList:
+    """
+    Do-not-call numbers from every .csv / .txt file in `directory`.
+
+    Each file is held as a sorted int64 array (8 bytes per number) and
+    looked up with a binary search. reload() only re-reads files whose size
+    or mtime changed, so it is cheap enough to run before every campaign.
+    """
+
+    def __init__(self, directory: str, default_country_code: str = ""):
+        self.directory = directory
+        self.default_country_code = default_country_code
+        self.lock = Lock()
+        self.reload_lock = Lock()
+        self.sources: dict[str, tuple] = {}  # filename → ((mtime_ns, size), keys)
+        self.hits = {"upload": 0, "dial": 0}
+
+    def reload(self) -> dict:
+        with self.reload_lock:
+            return self._reload()
+
+    def _reload(self) -> dict:
+        seen = set()
+        loaded = []
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                if not name.lower().endswith(SUPPRESSION_EXTENSIONS):
+                    continue
+                path = os.path.join(self.directory, name)
+                st = os.stat(path)
+                signature = (st.st_mtime_ns, st.st_size)
+                seen.add(name)
+
+                current = self.sources.get(name)
+                if current and current[0] == signature:
+                    continue
+
+                start = time.perf_counter()
+                keys = load_dnc_file(path, self.default_country_code)
+                print(f"Suppression list loaded: {name} → {len(keys)} numbers "
+                      f"in {time.perf_counter() - start:.2f}s")
+                loaded.append(name)
+                with self.lock:
+                    self.sources = {**self.sources, name: (signature, keys)}
+
+        removed = [name for name in self.sources if name not in seen]
+        if removed:
+            with self.lock:
+                self.sources = {n: v for n, v in self.sources.items() if n not in removed}
+
+        return {"loaded": loaded, "removed": removed, "entries": len(self)}
+
+    def contains(self, phone: str, stage: str = None) -> bool:
+        key = phone_key(phone)
+        if not key:
+            return False
+
+        # The dict is swapped, never mutated, so a lock-free read is consistent
+        for _, keys in self.sources.values():
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                if stage:
+                    with self.lock:
+                        self.hits[stage] = self.hits.get(stage, 0) + 1
+                return True
+        return False
+
+    def reset_hits(self):
+        with self.lock:
+            self.hits = {"upload": 0, "dial": 0}
+
+    def __len__(self) -> int:
+        return sum(len(keys) for _, keys in self.sources.values())
+
+    def stats(self) -> dict:
+        sources = self.sources
+        with self.lock:
+            hits = dict(self.hits)
+        return {
+            "entries": sum(len(keys) for _, keys in sources.values()),
+            "memory_bytes": sum(keys.itemsize * len(keys) for _, keys in sources.values()),
+            "sources": {name: len(keys) for name, (_, keys) in sources.items()},
+            "suppressed": hits,
+        }
+
+
+# ─── Benchmark ──────────────
+# python suppression.py [N]  → build an N-number list and measure lookups/s
+
+def run_benchmark(n: int = 5_000_000, lookups: int = 1_000_000):
+    directory = tempfile.mkdtemp()
+    rng = random.Random(42)
+    numbers = [61400000000 + rng.randrange(100_000_000) for _ in range(n)]
+
+    path = os.path.join(directory, "dnc.txt")
+    with open(path, "w") as f:
+        f.writelines(f"0{str(num)[2:]}\n" for num in numbers)
+
+    del numbers[n // 10:]  # only a sample is needed for the probes below
+
+    dnc = SuppressionList(directory, default_country_code="61")
+    tracemalloc.start()
+    start = time.perf_counter()
+    dnc.reload()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Loaded {len(dnc)} unique numbers from {n} lines in {elapsed:.2f}s, "
+          f"{dnc.stats()['memory_bytes'] / 1e6:.1f} MB retained, {peak / 1e6:.1f} MB peak while loading")
+
+    start = time.perf_counter()
+    dnc.reload()
+    print(f"Incremental reload (no changes): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    probes = [f"+{rng.choice(numbers)}" for _ in range(lookups // 2)]
+    probes += [f"+{61500000000 + rng.randrange(100_000_000)}" for _ in range(lookups // 2)]
+    rng.shuffle(probes)
+
+    start = time.perf_counter()
+    hits = sum(1 for p in probes if dnc.contains(p))
+    elapsed = time.perf_counter() - start
+    print(f"{lookups} lookups ({hits} hits) in {elapsed:.2f}s → {lookups / elapsed:,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
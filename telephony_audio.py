@@ -0,0 +1,141 @@
+import os
+import struct
+import sys
+import time
+
+import requests
+
+from config import TELEPHONY_AUDIO_FORMATS
+
+# ElevenLabs output_format → (file suffix next to the .mp3, Accept header)
+# The phone line is 8 kHz mono, so anything richer is thrown away by Twilio.
+TELEPHONY_PROFILES = {
+    "ulaw_8000": (".ulaw.wav", "audio/basic"),
+    "mp3_22050_32": (".32k.mp3", "audio/mpeg"),
+}
+
+WAVE_FORMAT_MULAW = 7
+
+
+def ulaw_to_wav(raw: bytes, sample_rate: int = 8000) -> bytes:
+    """Wrap raw 8-bit mono μ-law samples in a WAV container Twilio can <Play>."""
+    # Non-PCM WAV: 18 byte fmt chunk (with cbSize) + fact chunk with the sample count
+    fmt_chunk = struct.pack(
+        "<4sIHHIIHHH",
+        b"fmt ", 18,
+        WAVE_FORMAT_MULAW,
+        1,              # channels
+        sample_rate,
+        sample_rate,    # byte rate: 1 byte per sample, mono
+        1,              # block align
+        8,              # bits per sample
+        0,              # cbSize
+    )
+    fact_chunk = struct.pack("<4sII", b"fact", 4, len(raw))
+    data_header = struct.pack("<4sI", b"data", len(raw))
+    pad = b"\x00" if len(raw) % 2 else b""
+
+    body = b"WAVE" + fmt_chunk + fact_chunk + data_header + raw + pad
+    return struct.pack("<4sI", b"RIFF", len(body)) + body
+
+
+def variant_path(mp3_path: str, output_format: str) -> str:
+    suffix, _ = TELEPHONY_PROFILES[output_format]
+    return mp3_path[:-len(".mp3")] + suffix
+
+
+def variant_filenames(base: str, formats) -> list:
+    """All candidate files for an asset, the original MP3 first."""
+    names = [f"{base}.mp3"]
+    for fmt in formats:
+        if fmt in TELEPHONY_PROFILES:
+            names.append(base + TELEPHONY_PROFILES[fmt][0])
+    return names
+
+
+def pick_smallest_variant(audio_dir: str, base: str, formats) -> str:
+    """
+    Return the filename of the smallest variant of `base` on disk.
+
+    Falls back to the plain MP3 name when nothing has been generated yet,
+    so the TwiML never points at a missing file because of a variant.
+    """
+    best_name, best_size = f"{base}.mp3", None
+    for name in variant_filenames(base, formats):
+        try:
+            size = os.path.getsize(os.path.join(audio_dir, name))
+        except OSError:
+            continue
+        if size and (best_size is None or size < best_size):
+            best_name, best_size = name, size
+    return best_name
+
+
+# ─── Benchmark ──────────────
+# python telephony_audio.py [BASE_URL]
+#
+# Reports bytes served per call for each variant set, using the assets in
+# audio/. With a BASE_URL it also fetches the first <Play> of a call from the
+# running server and reports time to first byte / full download, which is
+# what gates the callee hearing audio.
+
+def _call_assets(audio_dir: str) -> list:
+    # Greetings may exist only as a telephony variant (MP3 is just the fallback)
+    suffixes = [".mp3"] + [suffix for suffix, _ in TELEPHONY_PROFILES.values()]
+    hello = sorted({
+        f[:-len(suffix)] for f in os.listdir(audio_dir) if f.startswith("hello_")
+        for suffix in suffixes if f.endswith("_v3" + suffix)
+    })
+    return hello[:1] + ["common_message_v3", "thank_you_goodbye_v3"]
+
+
+def _size_or_none(audio_dir: str, name: str):
+    path = os.path.join(audio_dir, name)
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def _time_fetch(url: str):
+    start = time.perf_counter()
+    with requests.get(url, stream=True, timeout=30) as resp:
+        resp.raise_for_status()
+        chunks = resp.iter_content(chunk_size=4096)
+        first = next(chunks, b"")
+        ttfb = time.perf_counter() - start
+        total = len(first) + sum(len(c) for c in chunks)
+    return ttfb, time.perf_counter() - start, total
+
+
+def run_benchmark(audio_dir: str, base_url: str = None):
+    bases = _call_assets(audio_dir)
+    print(f"Assets played per call: {', '.join(bases)}")
+
+    columns = [("original mp3", lambda b: f"{b}.mp3")]
+    for fmt, (suffix, _) in TELEPHONY_PROFILES.items():
+        columns.append((fmt, lambda b, s=suffix: b + s))
+    # What /twilio/voice would actually serve with the configured formats
+    columns.append(("picked", lambda b: pick_smallest_variant(audio_dir, b, TELEPHONY_AUDIO_FORMATS)))
+
+    for label, name_for in columns:
+        sizes = [_size_or_none(audio_dir, name_for(b)) for b in bases]
+        if None in sizes:
+            print(f"{label:>14}: missing variants, skipped")
+            continue
+        print(f"{label:>14}: {sum(sizes):>9} bytes/call  ({', '.join(str(s) for s in sizes)})")
+
+    if not base_url:
+        return
+
+    first = bases[0]
+    for label, name_for in columns:
+        name = name_for(first)
+        if _size_or_none(audio_dir, name) is None:
+            continue
+        runs = [_time_fetch(f"{base_url}/audio/{name}") for _ in range(5)]
+        ttfb = sorted(r[0] for r in runs)[len(runs) // 2]
+        full = sorted(r[1] for r in runs)[len(runs) // 2]
+        print(f"{label:>14}: first audio {name} → ttfb {ttfb * 1000:.1f} ms, "
+              f"full {full * 1000:.1f} ms, {runs[0][2]} bytes")
+
+
+if __name__ == "__main__":
+    run_benchmark("audio", sys.argv[1].rstrip("/") if len(sys.argv) > 1 else None)